@@ -1,85 +1,271 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, Canvas
-from PIL import Image, ImageTk, ImageDraw
+from tkinter import ttk, filedialog, messagebox, font as tkfont
+from PIL import Image, ImageTk
 import configparser
 import os
-import csv
+import sys
 import shutil
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from tooltalk_api import TooltalkAPI
-from torque_graph import TorqueGraph, TestPhaseDialog
+
+# Hole labels A..Z, sliced to the number of holes under test
+ALPHABET = tuple(chr(c) for c in range(65, 91))
+# Wizard steps whose frames are kept and re-packed instead of rebuilt
+REUSABLE_STEPS = ("connect", "hole_sample", "torque_setting")
+# Minimum interval between label moves while dragging (~60 fps)
+DRAG_FRAME_MS = 16
+# Rows joined per write when saving results, bounding peak string memory
+CSV_BATCH_ROWS = 1000
+# Characters in a connection id that cannot appear in result filenames
+_FILENAME_UNSAFE = str.maketrans(':/\\ ', '____')
+# Live graph label formatters, bound once instead of re-parsed per result
+_NCM_FMT = '{:.1f} Ncm'.format
+_TITLE_FMT = 'Hole {} - Sample {}'.format
+_VALUES_FMT = 'Target: {:.1f} Ncm, Actual: {:.1f} Ncm'.format
+
+def _write_all(fd, data):
+    """os.write until every byte of data is written (os.write may write partially)"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
 
 class DragLabel:
+    """A hole label on the placement canvas; dragging is handled per canvas by the wizard"""
+    # Named font shared by every hole label, created once the Tk root exists
+    _FONT = None
+    FILL = "red"
+    TAG = "draggable"
+
+    @classmethod
+    def font(cls, widget):
+        if cls._FONT is None:
+            cls._FONT = tkfont.Font(root=widget, family="Arial", size=16, weight="bold")
+        return cls._FONT
+
     def __init__(self, canvas, label, x, y):
         self.canvas = canvas
         self.label = label
-        self.id = canvas.create_text(x, y, text=label, font=("Arial", 16, "bold"), fill="red", tags="draggable")
-        self._drag_data = {"x": 0, "y": 0}
-        canvas.tag_bind(self.id, "<ButtonPress-1>", self.on_start)
-        canvas.tag_bind(self.id, "<ButtonRelease-1>", self.on_drop)
-        canvas.tag_bind(self.id, "<B1-Motion>", self.on_drag)
-
-    def on_start(self, event):
-        self._drag_data["x"] = event.x
-        self._drag_data["y"] = event.y
-
-    def on_drag(self, event):
-        dx = event.x - self._drag_data["x"]
-        dy = event.y - self._drag_data["y"]
-        self.canvas.move(self.id, dx, dy)
-        self._drag_data["x"] = event.x
-        self._drag_data["y"] = event.y
-
-    def on_drop(self, event):
-        pass
+        self.id = canvas.create_text(x, y, text=label, font=self.font(canvas),
+                                     fill=self.FILL, tags=self.TAG)
 
     def get_position(self):
         return self.canvas.coords(self.id)
 
 class TorqueTestWizard:
+    # Prerendered RGBA stamps for each hole letter, built once on first save
+    _label_stamps = None
+    # Hole order per image for each preset, matching the files in lib/preset
+    _PRESET_HOLES = {
+        "scube lid GigE": [
+            ['A', 'B', 'C', 'D', 'G'],  # ace_GigE_Lid_A_B_C_D_G.png
+            ['E', 'F'],                 # ace_GigE_Lid_E_F.png
+        ],
+    }
+
     def __init__(self, root):
         self.root = root
         self.root.title("Torque Test Tooltalk Wizard")
         self.api = TooltalkAPI()
         self.config = configparser.ConfigParser()
         self.config_file = 'config/settings.ini'
+        self.init_folders()
         self.load_config()
         self.state = {}
         self.frames = {}
+        # Per-step callbacks that reset a cached frame's widgets when it is shown again
+        self._step_refresh = {}
         self.current_frame = None
-        self.init_folders()
+        # Live graph figure is created on first use and reused for every test
+        self._live_fig = None
+        self._live_draw_cid = None
+        self._live_sample_counter = 0
+        # Summary plot figure and its preview image are reused across restarts
+        self._plot_fig = None
+        self._plot_tk_img = None
+        # Background PNG saves that must finish before the figure is reused
+        self._pending_saves = []
+        # Single worker so labeled image saves complete in order
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        # Labeled image saves queued on _io_pool that Restart and close wait for
+        self._pending_label_saves = []
+        # Decoded and resized images keyed by (path, size, resample)
+        self._img_cache = {}
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.show_step("connect")
 
+    def on_close(self):
+        """Finish pending saves and release figures before the window goes away"""
+        self._join_pending_saves()
+        # Let queued labeled PNGs finish writing instead of being cut off at exit
+        self._io_pool.shutdown(wait=True)
+        # Also closes a socket still kept from Test Connection
+        self.api.disconnect()
+        # pyplot is only loaded once a test phase has run; don't import it just to close
+        plt = sys.modules.get('matplotlib.pyplot')
+        if plt is not None:
+            plt.close('all')
+        self.root.destroy()
+
+    def _schedule_probe_close(self):
+        """Close the tested socket if Connect is not pressed within the reuse window"""
+        self.root.after(int(self.api.probe_reuse_ttl * 1000), self.api.close_stale_probe)
+
     def load_config(self):
-        if not os.path.exists(self.config_file):
-            os.makedirs('config', exist_ok=True)
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                self.config.read_string(f.read())
+        except FileNotFoundError:
             self.config['DEFAULT'] = {
                 'com_port': 'COM3',
                 'default_target_torque': '24',
                 'output_directory': 'results',
                 'enable_live_graphs': 'true',
                 'enable_test_phase': 'true',
+                'live_graph_interval': '5',
                 'controller_ip': '192.168.1.100',
                 'controller_port': '4545',
                 'connection_timeout': '5'
             }
-            with open(self.config_file, 'w') as f:
-                self.config.write(f)
-        self.config.read(self.config_file)
+            self.save_config()
+        # Parse once so step transitions and test loops read plain values
+        defaults = self.config['DEFAULT']
+        self.cfg = {
+            'default_target_torque': float(defaults.get('default_target_torque', '24')),
+            'enable_live_graphs': self.config.getboolean('DEFAULT', 'enable_live_graphs', fallback=True),
+            'enable_test_phase': self.config.getboolean('DEFAULT', 'enable_test_phase', fallback=True),
+            'live_graph_interval': max(int(defaults.get('live_graph_interval', '5')), 1),
+            'controller_ip': defaults.get('controller_ip', '192.168.1.100')
+        }
+
+    def save_config(self):
+        """Write settings via a temp file and os.replace so the file is never left torn"""
+        tmp_path = self.config_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            self.config.write(f)
+        os.replace(tmp_path, self.config_file)
+
+    def _bind_draggable(self, canvas):
+        """Bind one set of drag handlers to the "draggable" tag instead of per-item bindings"""
+        # Item being dragged, last applied pointer position, latest pointer position and
+        # the pending flush job; motion events are coalesced into one move per frame
+        self._drag = {"item": None, "x": 0, "y": 0, "last": (0, 0), "pending": None}
+        canvas.tag_bind(DragLabel.TAG, "<ButtonPress-1>", self._on_drag_start)
+        canvas.tag_bind(DragLabel.TAG, "<B1-Motion>", self._on_drag_motion)
+        canvas.tag_bind(DragLabel.TAG, "<ButtonRelease-1>", self._on_drag_drop)
+
+    def _on_drag_start(self, event):
+        canvas = event.widget
+        current = canvas.find_withtag("current")
+        self._drag["item"] = current[0] if current else None
+        self._drag["x"] = event.x
+        self._drag["y"] = event.y
+        self._drag["last"] = (event.x, event.y)
+
+    def _on_drag_motion(self, event):
+        self._drag["last"] = (event.x, event.y)
+        if self._drag["pending"] is None:
+            self._drag["pending"] = event.widget.after(DRAG_FRAME_MS, self._flush_drag, event.widget)
+
+    def _flush_drag(self, canvas):
+        drag = self._drag
+        drag["pending"] = None
+        if drag["item"] is None:
+            return
+        x, y = drag["last"]
+        dx = x - drag["x"]
+        dy = y - drag["y"]
+        if dx or dy:
+            canvas.move(drag["item"], dx, dy)
+        drag["x"] = x
+        drag["y"] = y
+
+    def _on_drag_drop(self, event):
+        # Apply any motion still waiting for the next frame before releasing the item
+        if self._drag["pending"] is not None:
+            event.widget.after_cancel(self._drag["pending"])
+            self._flush_drag(event.widget)
+        self._drag["item"] = None
+
+    def _get_label_stamps(self):
+        """Rasterize A..Z once so saving a placement is a paste per label, not glyph rendering"""
+        if TorqueTestWizard._label_stamps is None:
+            from PIL import ImageDraw, ImageFont
+            try:
+                font = ImageFont.truetype("DejaVuSans.ttf", 16)
+            except OSError:
+                font = ImageFont.load_default()
+            stamps = {}
+            for ch in ALPHABET:
+                stamp = Image.new("RGBA", (20, 24), (0, 0, 0, 0))
+                ImageDraw.Draw(stamp).text((0, 0), ch, fill=(255, 0, 0, 255), font=font)
+                stamps[ch] = stamp
+            TorqueTestWizard._label_stamps = stamps
+        return TorqueTestWizard._label_stamps
+
+    def _write_labeled_png(self, pil_img, positions, stamps, out_path):
+        """Composite label stamps onto a copy of pil_img and save it; runs on the I/O pool"""
+        try:
+            img = pil_img.convert("RGBA")
+            for label, (x, y) in positions.items():
+                img.alpha_composite(stamps[label], dest=(max(int(x), 0), max(int(y), 0)))
+            # Intermediate record, so favour encode speed over file size
+            img.save(out_path, "PNG", compress_level=1)
+        except Exception as e:
+            print(f"Error saving labeled image: {e}")
+
+    def _get_tk_image(self, path, size=(500, 400), resample=Image.BILINEAR):
+        """Return a (PIL image, PhotoImage) pair for path, decoding and resizing only once
+        
+        Previews default to BILINEAR, which is visually indistinguishable from
+        LANCZOS at 500x400 and far cheaper for large photos.
+        """
+        key = (path, size, resample)
+        hit = self._img_cache.get(key)
+        if hit:
+            return hit
+        pil_img = Image.open(path)
+        pil_img.load()
+        # Palette/greyscale images are converted once so resampling and the later
+        # RGBA label composite work on a native RGB(A) buffer
+        if pil_img.mode not in ('RGB', 'RGBA'):
+            pil_img = pil_img.convert('RGBA' if 'transparency' in pil_img.info else 'RGB')
+        if pil_img.size != size:
+            # reducing_gap box-reduces large photos first, so the filter runs on a small image
+            pil_img = pil_img.resize(size, resample, reducing_gap=3.0)
+        tk_img = ImageTk.PhotoImage(pil_img)
+        self._img_cache[key] = (pil_img, tk_img)
+        return pil_img, tk_img
+
+    def _forget_image(self, path):
+        """Drop cached entries for a file that has been rewritten on disk"""
+        for key in [k for k in self._img_cache if k[0] == path]:
+            del self._img_cache[key]
 
     def init_folders(self):
-        os.makedirs('lib', exist_ok=True)
-        os.makedirs('lib/preset', exist_ok=True)
-        os.makedirs('results', exist_ok=True)
+        for d in ('config', 'lib', 'lib/preset', 'results'):
+            os.makedirs(d, exist_ok=True)
 
     def clear_frame(self):
         if self.current_frame:
-            self.current_frame.destroy()
+            # Cached step frames are only hidden so they can be shown again
+            if self.current_frame in self.frames.values():
+                self.current_frame.pack_forget()
+            else:
+                self.current_frame.destroy()
         self.current_frame = None
 
     def show_step(self, step):
         self.clear_frame()
+        if step in self.frames:
+            self.current_frame = self.frames[step]
+            refresh = self._step_refresh.get(step)
+            if refresh:
+                refresh()
+            self.current_frame.pack(fill=tk.BOTH, expand=True)
+            return
         if step == "connect":
             self.show_connect()
         elif step == "test_phase":
@@ -96,6 +282,9 @@ class TorqueTestWizard:
             self.show_run_test()
         elif step == "show_plot":
             self.show_plot()
+        # Steps whose widgets don't depend on earlier answers are built only once
+        if step in REUSABLE_STEPS and self.current_frame is not None:
+            self.frames[step] = self.current_frame
 
     def show_connect(self):
         frame = ttk.Frame(self.root, padding=20)
@@ -121,7 +310,7 @@ class TorqueTestWizard:
         
         ttk.Label(ip_frame, text="Controller IP Address:").pack(anchor=tk.W)
         
-        ip_var = tk.StringVar(value=self.config['DEFAULT']['controller_ip'])
+        ip_var = tk.StringVar(value=self.cfg['controller_ip'])
         ip_entry = ttk.Entry(ip_frame, textvariable=ip_var, width=20)
         ip_entry.pack(side=tk.LEFT, padx=(0, 5))
         
@@ -133,11 +322,12 @@ class TorqueTestWizard:
                 return
             
             status_lbl.config(text="Testing IP connectivity...", foreground="orange")
-            self.root.update()
+            self.root.update_idletasks()
             
             try:
                 if self.api.test_connection(ip_address):
                     status_lbl.config(text=f"Controller reachable at {ip_address}", foreground="green")
+                    self._schedule_probe_close()
                 else:
                     status_lbl.config(text=f"Controller not reachable at {ip_address}", foreground="red")
             except Exception as e:
@@ -157,11 +347,12 @@ class TorqueTestWizard:
                 return
             
             status_lbl.config(text="Testing connection...", foreground="orange")
-            self.root.update()
+            self.root.update_idletasks()
             
             try:
                 if self.api.test_connection(ip_address):
                     status_lbl.config(text="Connection verified!", foreground="green")
+                    self._schedule_probe_close()
                 else:
                     status_lbl.config(text="Connection failed", foreground="red")
                     messagebox.showerror("Connection Failed", 
@@ -185,7 +376,7 @@ class TorqueTestWizard:
                 self.state['simulation_mode'] = True
                 
                 # Check if test phase is enabled
-                if self.config.getboolean('DEFAULT', 'enable_test_phase', fallback=True):
+                if self.cfg['enable_test_phase']:
                     self.root.after(800, lambda: self.show_step("test_phase"))
                 else:
                     self.root.after(800, lambda: self.show_step("hole_sample"))
@@ -197,7 +388,9 @@ class TorqueTestWizard:
                     return
                 
                 status_lbl.config(text="Connecting...", foreground="orange")
-                self.root.update()
+                # Block re-entry while the blocking connect sequence runs
+                connect_btn.config(state='disabled')
+                self.root.update_idletasks()
                 
                 try:
                     # First test the connection
@@ -221,13 +414,14 @@ class TorqueTestWizard:
                         status_lbl.config(text="Connected and Ready", foreground="green")
                         self.state['controller_ip'] = ip_address
                         self.state['simulation_mode'] = False
-                        # Save the working IP to config
-                        self.config['DEFAULT']['controller_ip'] = ip_address
-                        with open(self.config_file, 'w') as f:
-                            self.config.write(f)
+                        # Save the working IP to config, only touching disk when it changed
+                        if ip_address != self.cfg['controller_ip']:
+                            self.cfg['controller_ip'] = ip_address
+                            self.config['DEFAULT']['controller_ip'] = ip_address
+                            self.save_config()
                         
                         # Check if test phase is enabled
-                        if self.config.getboolean('DEFAULT', 'enable_test_phase', fallback=True):
+                        if self.cfg['enable_test_phase']:
                             self.root.after(800, lambda: self.show_step("test_phase"))
                         else:
                             self.root.after(800, lambda: self.show_step("hole_sample"))
@@ -240,10 +434,22 @@ class TorqueTestWizard:
                 except Exception as e:
                     status_lbl.config(text="Connection error", foreground="red")
                     messagebox.showerror("Connection Error", f"Error connecting to controller: {str(e)}")
+                finally:
+                    connect_btn.config(state='normal')
         
         connect_btn = ttk.Button(frame, text="Connect & Continue", command=connect)
         connect_btn.pack(pady=10)
         
+        def refresh():
+            """Show the cached page as a fresh one would, not as the last run left it"""
+            if simulation_var.get():
+                simulation_var.set(False)
+                self.toggle_simulation_mode(False, connection_frame)
+            ip_var.set(self.cfg['controller_ip'])
+            status_lbl.config(text="Not connected", foreground="red")
+            connect_btn.config(state='normal')
+        self._step_refresh["connect"] = refresh
+        
         # Store references for toggling
         self.connection_frame = connection_frame
         self.simulation_var = simulation_var
@@ -259,7 +465,8 @@ class TorqueTestWizard:
         ttk.Label(frame, text="Testing screwdriver trigger and live torque capture...", 
                  font=("Arial", 12)).pack(pady=10)
         
-        # Show the test phase dialog
+        # Show the test phase dialog (torque_graph pulls in matplotlib, so import on demand)
+        from torque_graph import TestPhaseDialog
         simulation_mode = self.state.get('simulation_mode', False)
         test_dialog = TestPhaseDialog(self.root, self.api, simulation_mode)
         result = test_dialog.show()
@@ -331,8 +538,11 @@ class TorqueTestWizard:
                         "ace_GigE_Lid_A_B_C_D_G.png",
                         "ace_GigE_Lid_E_F.png"
                     ]
-                    holes = ['A', 'B', 'C', 'D', 'E', 'F', 'G']  # All holes for this preset
-                    img_hole_counts = [5, 2]  # First image has 5 holes (A,B,C,D,G), second has 2 (E,F)
+                    # Per-image hole layout comes from _PRESET_HOLES, as in show_run_test
+                    holes_per_image = self._PRESET_HOLES[preset_name]
+                    # All holes for this preset, in letter order for the results
+                    holes = sorted(h for image_holes in holes_per_image for h in image_holes)
+                    img_hole_counts = [len(image_holes) for image_holes in holes_per_image]
                 else:
                     messagebox.showerror("Error", "Unknown preset selected.")
                     return
@@ -356,6 +566,7 @@ class TorqueTestWizard:
                 self.state['samples'] = samples
                 self.state['images'] = image_paths
                 self.state['img_hole_counts'] = img_hole_counts
+                self.state['img_hole_offsets'] = list(itertools.accumulate([0] + img_hole_counts))
                 self.state['using_preset'] = True
                 self.state['preset_name'] = preset_name
                 
@@ -368,13 +579,24 @@ class TorqueTestWizard:
                 if n < 1 or s < 1 or n > 26:
                     messagebox.showerror("Input Error", "Number of holes/samples must be 1-26.")
                     return
-                self.state['holes'] = [chr(65+i) for i in range(n)]
+                self.state['holes'] = list(ALPHABET[:n])
                 self.state['samples'] = s
                 self.state['using_preset'] = False
                 self.show_step("image_upload")
         
         ttk.Button(frame, text="Next", command=next_).pack(pady=20)
         
+        def refresh():
+            """Reset the cached inputs to the defaults a fresh page starts with"""
+            if use_preset_var.get():
+                use_preset_var.set(False)
+                self.toggle_preset_mode(False, manual_frame, preset_config_frame)
+            preset_combo.set("scube lid GigE")
+            preset_samples_var.set(1)
+            holes_var.set(5)
+            samples_var.set(1)
+        self._step_refresh["hole_sample"] = refresh
+        
         # Store references for toggling
         self.preset_config_frame = preset_config_frame
         self.manual_frame = manual_frame
@@ -409,6 +631,7 @@ class TorqueTestWizard:
         img_labels = ttk.Label(frame, text="No images uploaded yet.")
         img_labels.pack(pady=5)
         def upload_images():
+            from tkinter import simpledialog
             count = img_count_var.get()
             if count < 1 or count > len(self.state['holes']):
                 messagebox.showerror("Input Error", "Image count must be 1 or more, and not more than number of holes.")
@@ -416,20 +639,30 @@ class TorqueTestWizard:
             img_files.clear()
             img_hole_counts.clear()
             img_labels.config(text="")
-            for i in range(count):
-                file = filedialog.askopenfilename(title=f"Select image {i+1}", filetypes=[("Image Files", "*.png;*.jpg;*.jpeg")])
-                if not file:
-                    messagebox.showerror("Input Error", "All images must be selected.")
-                    return
-                img_files.append(file)
+            filetypes = [("Image Files", "*.png;*.jpg;*.jpeg")]
+            # One multi-select dialog; only fall back to one dialog per image on a count mismatch
+            files = filedialog.askopenfilenames(title=f"Select {count} image(s)", filetypes=filetypes)
+            if len(files) == count:
+                img_files.extend(files)
+            elif files:
+                for i in range(count):
+                    file = filedialog.askopenfilename(title=f"Select image {i+1}", filetypes=filetypes)
+                    if not file:
+                        messagebox.showerror("Input Error", "All images must be selected.")
+                        return
+                    img_files.append(file)
+            else:
+                messagebox.showerror("Input Error", "All images must be selected.")
+                return
             total_holes = len(self.state['holes'])
             remaining = total_holes
             for i in range(count):
                 if count == 1:
                     img_hole_counts.append(total_holes)
                 else:
-                    prompt = f"How many screw holes in image {i+1}? (Remaining: {remaining})"
-                    n = tk.simpledialog.askinteger("Holes per image", prompt, minvalue=1, maxvalue=remaining)
+                    prompt = (f"How many screw holes in image {i+1} ({os.path.basename(img_files[i])})? "
+                              f"(Remaining: {remaining})")
+                    n = simpledialog.askinteger("Holes per image", prompt, minvalue=1, maxvalue=remaining)
                     if n is None or n > remaining:
                         messagebox.showerror("Input Error", "Invalid hole count.")
                         return
@@ -438,17 +671,29 @@ class TorqueTestWizard:
             if sum(img_hole_counts) != total_holes:
                 messagebox.showerror("Input Error", "Total holes assigned does not match.")
                 return
-            # Copy images to lib/
+            # Copy images to lib/ in the background; Next stays blocked until done
             lib_files = []
             for i, f in enumerate(img_files):
                 ext = os.path.splitext(f)[1]
-                dest = os.path.join('lib', f"img_{i+1}{ext}")
-                shutil.copy(f, dest)
-                lib_files.append(dest)
-            self.state['images'] = lib_files
-            self.state['img_hole_counts'] = img_hole_counts
-            img_labels.config(text="\n".join([os.path.basename(f) for f in lib_files]))
-        ttk.Button(frame, text="Upload Images", command=upload_images).pack(pady=5)
+                lib_files.append(os.path.join('lib', f"img_{i+1}{ext}"))
+            self.state.pop('images', None)
+            upload_btn.config(state='disabled')
+            img_labels.config(text="Copying images...")
+            def copy_done(error):
+                upload_btn.config(state='normal')
+                if error:
+                    img_labels.config(text="No images uploaded yet.")
+                    messagebox.showerror("Copy Error", f"Could not copy images: {error}")
+                    return
+                for dest in lib_files:
+                    self._forget_image(dest)
+                self.state['images'] = lib_files
+                self.state['img_hole_counts'] = img_hole_counts
+                self.state['img_hole_offsets'] = list(itertools.accumulate([0] + img_hole_counts))
+                img_labels.config(text="\n".join([os.path.basename(f) for f in lib_files]))
+            self._copy_async(list(zip(img_files, lib_files)), copy_done)
+        upload_btn = ttk.Button(frame, text="Upload Images", command=upload_images)
+        upload_btn.pack(pady=5)
         def next_():
             if 'images' not in self.state:
                 messagebox.showerror("Input Error", "Please upload images and assign holes.")
@@ -457,6 +702,26 @@ class TorqueTestWizard:
         ttk.Button(frame, text="Next", command=next_).pack(pady=10)
         self.current_frame = frame
 
+    def _copy_async(self, pairs, callback):
+        """Copy (src, dest) pairs in a worker thread, then call callback(error) on the Tk thread"""
+        outcome = {'error': None}
+        def worker():
+            try:
+                for src, dest in pairs:
+                    with open(src, 'rb') as fsrc, open(dest, 'wb') as fdst:
+                        shutil.copyfileobj(fsrc, fdst, length=1 << 20)
+            except Exception as e:
+                outcome['error'] = e
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        # Tk is not thread-safe, so the main loop polls for completion
+        def poll():
+            if thread.is_alive():
+                self.root.after(50, poll)
+            else:
+                callback(outcome['error'])
+        self.root.after(50, poll)
+
     def show_label_placement(self):
         # Skip label placement if using preset (images already have labels)
         if self.state.get('using_preset', False):
@@ -470,22 +735,18 @@ class TorqueTestWizard:
         if 'label_placement_idx' not in self.state:
             self.state['label_placement_idx'] = 0
             self.state['label_placement_holes'] = self.state['holes'][:]
-            self.state['labeled_images'] = []
             self.state['label_positions'] = []
         img_idx = self.state['label_placement_idx']
         img_path = self.state['images'][img_idx]
-        pil_img = Image.open(img_path)
-        pil_img = pil_img.resize((500, 400), Image.LANCZOS)
-        tk_img = ImageTk.PhotoImage(pil_img)
-        canvas = Canvas(frame, width=500, height=400, bg="white")
+        pil_img, tk_img = self._get_tk_image(img_path)
+        canvas = tk.Canvas(frame, width=500, height=400, bg="white")
         canvas.pack()
         canvas.create_image(0, 0, anchor=tk.NW, image=tk_img)
         # Assign holes to this image
-        start = 0
-        for i in range(img_idx):
-            start += self.state['img_hole_counts'][i]
+        start = self.state['img_hole_offsets'][img_idx]
         count = self.state['img_hole_counts'][img_idx]
         holes = self.state['holes'][start:start+count]
+        self._bind_draggable(canvas)
         drag_labels = []
         for i, label in enumerate(holes):
             drag_labels.append(DragLabel(canvas, label, 50+60*i, 30))
@@ -494,13 +755,12 @@ class TorqueTestWizard:
             for dl in drag_labels:
                 x, y = dl.get_position()
                 positions[dl.label] = (x, y)
-            img = pil_img.copy()
-            draw = ImageDraw.Draw(img)
-            for label, (x, y) in positions.items():
-                draw.text((x, y), label, fill="red")
             out_path = os.path.join('lib', f"labeled_img_{img_idx+1}.png")
-            img.save(out_path)
-            self.state['labeled_images'].append(out_path)
+            # Saved as a record of the placement; the test step redraws labels itself,
+            # so the wizard advances without waiting for the composite and PNG encode
+            self._pending_label_saves.append(
+                self._io_pool.submit(self._write_labeled_png, pil_img, positions,
+                                     self._get_label_stamps(), out_path))
             self.state['label_positions'].append(positions)
             # Move to next image or next step
             self.state['label_placement_idx'] += 1
@@ -519,191 +779,347 @@ class TorqueTestWizard:
         frame = ttk.Frame(self.root, padding=20)
         frame.pack(fill=tk.BOTH, expand=True)
         ttk.Label(frame, text="Set Torque Setting", font=("Arial", 16)).pack(pady=10)
-        torque_var = tk.DoubleVar(value=float(self.config['DEFAULT']['default_target_torque']))
+        torque_var = tk.DoubleVar(value=self.cfg['default_target_torque'])
         ttk.Label(frame, text="Torque (Ncm-1):").pack()
         ttk.Entry(frame, textvariable=torque_var, width=10).pack(pady=2)
         def next_():
             self.state['torque'] = torque_var.get()
             self.show_step("run_test")
         ttk.Button(frame, text="Start Test", command=next_).pack(pady=10)
+        self._step_refresh["torque_setting"] = lambda: torque_var.set(self.cfg['default_target_torque'])
         self.current_frame = frame
 
     def show_run_test(self):
         frame = ttk.Frame(self.root, padding=20)
         frame.pack(fill=tk.BOTH, expand=True)
         ttk.Label(frame, text="Running Test", font=("Arial", 16)).pack(pady=10)
-        results = []
         sample_count = self.state['samples']
         torque = self.state['torque']
         simulation_mode = self.state.get('simulation_mode', False)
+        # Bound once so each Record press is a single call with no mode branch
+        api_test = self.api.simulate_torque_test if simulation_mode else self.api.run_torque_test
+        live_graphs = self.cfg['enable_live_graphs']
         
-        # Handle preset vs manual mode differently
+        # Both modes test the source images; only the hole order per image differs
+        images = self.state['images']
         if self.state.get('using_preset', False):
-            # For presets, use the original preset images and predefined hole order
-            preset_name = self.state['preset_name']
-            if preset_name == "scube lid GigE":
-                # Define holes per image for this preset
-                holes_per_image = [
-                    ['A', 'B', 'C', 'D', 'G'],  # First image: ace_GigE_Lid_A_B_C_D_G.png
-                    ['E', 'F']                   # Second image: ace_GigE_Lid_E_F.png
-                ]
-            else:
+            holes_per_image = self._PRESET_HOLES.get(self.state['preset_name'])
+            if holes_per_image is None:
                 messagebox.showerror("Error", "Unknown preset configuration.")
                 return
-            
-            for sample in range(sample_count):
-                messagebox.showinfo("Sample", f"Prepare for sample {sample+1} of {sample_count}")
-                for img_idx, img_path in enumerate(self.state['images']):
-                    pil_img = Image.open(img_path)
-                    pil_img = pil_img.resize((500, 400), Image.LANCZOS)
-                    tk_img = ImageTk.PhotoImage(pil_img)
-                    img_win = tk.Toplevel(self.root)
-                    img_win.title(f"Sample {sample+1} - Image {img_idx+1}")
-                    canvas = Canvas(img_win, width=500, height=400)
-                    canvas.pack()
-                    canvas.create_image(0, 0, anchor=tk.NW, image=tk_img)
-                    img_win.tk_img = tk_img
-                    
-                    # Use predefined holes for this image
-                    for label in holes_per_image[img_idx]:
-                        if simulation_mode:
-                            messagebox.showinfo("Simulation", f"Simulating torque test for hole {label} (Sample {sample+1})")
-                            result = self.api.simulate_torque_test(label, torque)
-                        else:
-                            messagebox.showinfo("Test", f"Place screwdriver at hole {label} (Sample {sample+1}) and press OK to record.")
-                            result = self.api.run_torque_test(label, torque)
-                        result['sample'] = sample+1
-                        results.append(result)
-                        
-                        # Show live graph if enabled
-                        if self.config.getboolean('DEFAULT', 'enable_live_graphs', fallback=True):
-                            self._show_live_graph_for_test(label, sample+1, result)
-                    img_win.destroy()
+            # Preset images already show their hole letters
+            label_positions = None
         else:
-            # For manual mode, use labeled images and positions
-            holes_per_image = [list(d.keys()) for d in self.state['label_positions']]
+            # For manual mode, overlay the placed labels on the cached source images
+            # rather than decoding the labeled PNGs written during placement
+            label_positions = self.state['label_positions']
+            holes_per_image = [list(d) for d in label_positions]
+        
+        # Every hole test in the order the user is guided through them
+        steps = [(sample+1, img_idx, label)
+                 for sample in range(sample_count)
+                 for img_idx in range(len(images))
+                 for label in holes_per_image[img_idx]]
+        # One slot per step, filled in order as each hole is recorded
+        results = [None] * len(steps)
+        
+        # A persistent prompt and Record button replace the per-hole message boxes
+        status_lbl = ttk.Label(frame, text="", font=("Arial", 12), justify=tk.CENTER)
+        status_lbl.pack(pady=5)
+        content = ttk.Frame(frame)
+        content.pack()
+        canvas = tk.Canvas(content, width=500, height=400)
+        canvas.pack(side=tk.LEFT)
+        image_item = canvas.create_image(0, 0, anchor=tk.NW)
+        # Live graph sits next to the image and is updated in place per result
+        if live_graphs:
+            self._attach_live_graph(content).pack(side=tk.LEFT, padx=(10, 0))
+        record_btn = ttk.Button(frame, text="Record")
+        record_btn.pack(pady=10)
+        run = {'idx': 0, 'img_idx': None}
+        label_font = DragLabel.font(canvas)
+        
+        def prompt():
+            sample, img_idx, label = steps[run['idx']]
+            if img_idx != run['img_idx']:
+                _, tk_img = self._get_tk_image(images[img_idx])
+                canvas.itemconfig(image_item, image=tk_img)
+                if label_positions:
+                    canvas.delete("hole_label")
+                    for hole, (x, y) in label_positions[img_idx].items():
+                        canvas.create_text(x, y, text=hole, font=label_font,
+                                           fill=DragLabel.FILL, tags="hole_label")
+                run['img_idx'] = img_idx
+            if simulation_mode:
+                # Nothing for the operator to do, so run straight through the holes
+                status_lbl.config(text=f"Sample {sample} of {sample_count} - Image {img_idx+1}\n"
+                                       f"Simulating hole {label}...")
+                self.root.after_idle(record)
+                return
+            # The first hole of a sample doubles as the "prepare for sample" prompt
+            first = run['idx'] == 0 or steps[run['idx']-1][0] != sample
+            prepare = f"Prepare for sample {sample} of {sample_count}.\n" if first else ""
+            status_lbl.config(text=f"{prepare}Sample {sample} of {sample_count} - Image {img_idx+1}\n"
+                                   f"Place screwdriver at hole {label} and press Record.")
+            record_btn.config(state='normal')
+        
+        def record():
+            sample, img_idx, label = steps[run['idx']]
+            record_btn.config(state='disabled')
+            self.root.update_idletasks()
+            try:
+                result = api_test(label, torque)
+            except Exception as e:
+                messagebox.showerror("Test Error", f"Hole {label} (Sample {sample}): {str(e)}")
+                record_btn.config(state='normal')
+                return
+            result['sample'] = sample
+            results[run['idx']] = result
             
-            for sample in range(sample_count):
-                messagebox.showinfo("Sample", f"Prepare for sample {sample+1} of {sample_count}")
-                for img_idx, img_path in enumerate(self.state['labeled_images']):
-                    pil_img = Image.open(img_path)
-                    tk_img = ImageTk.PhotoImage(pil_img)
-                    img_win = tk.Toplevel(self.root)
-                    img_win.title(f"Sample {sample+1} - Image {img_idx+1}")
-                    canvas = Canvas(img_win, width=500, height=400)
-                    canvas.pack()
-                    canvas.create_image(0, 0, anchor=tk.NW, image=tk_img)
-                    img_win.tk_img = tk_img
-                    positions = self.state['label_positions'][img_idx]
-                    for label in holes_per_image[img_idx]:
-                        if simulation_mode:
-                            messagebox.showinfo("Simulation", f"Simulating torque test for hole {label} (Sample {sample+1})")
-                            result = self.api.simulate_torque_test(label, torque)
-                        else:
-                            messagebox.showinfo("Test", f"Place screwdriver at hole {label} (Sample {sample+1}) and press OK to record.")
-                            result = self.api.run_torque_test(label, torque)
-                        result['sample'] = sample+1
-                        results.append(result)
-                        
-                        # Show live graph if enabled
-                        if self.config.getboolean('DEFAULT', 'enable_live_graphs', fallback=True):
-                            self._show_live_graph_for_test(label, sample+1, result)
-                    img_win.destroy()
-        
-        self.state['results'] = results
-        self.save_results_csv()
-        self.show_step("show_plot")
+            # Show live graph if enabled
+            if live_graphs:
+                self._show_live_graph_for_test(label, sample, result)
+            
+            run['idx'] += 1
+            if run['idx'] == len(steps):
+                self.state['results'] = results
+                self.show_step("show_plot")
+            else:
+                self.root.after_idle(prompt)
+        
+        record_btn.config(command=record, state='disabled')
         self.current_frame = frame
+        self.root.after_idle(prompt)
+
+    def _attach_live_graph(self, master):
+        """Embed the live graph in master, building the figure and its artists only once"""
+        # matplotlib is imported on first use to keep startup fast
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        if self._live_fig is None:
+            from matplotlib.figure import Figure
+            from matplotlib import colors as mcolors
+            
+            self._live_fig = Figure(figsize=(5, 4))
+            self._live_ax = ax = self._live_fig.add_subplot()
+            ax.set_ylabel('Torque (Ncm)')
+            ax.grid(True, alpha=0.3)
+            
+            # Bars, value labels and title change per test; they are animated so the
+            # static axes can be cached as a background and only these get blitted
+            bar_colors = (mcolors.to_rgba('lightblue', 0.7), mcolors.to_rgba('lightgreen', 0.7))
+            self._live_bars = list(ax.bar(['Target', 'Actual'], [0, 0], color=bar_colors))
+            self._live_texts = [ax.text(bar.get_x() + bar.get_width()/2., 0, '',
+                                        ha='center', va='bottom') for bar in self._live_bars]
+            # Title holds the hole/sample line; the numeric line is its own Text so
+            # it can change without re-laying out the title
+            ax.set_title(' ', pad=20)
+            self._live_values = ax.text(0.5, 1.01, '', transform=ax.transAxes,
+                                        ha='center', va='bottom')
+            self._live_artists = self._live_bars + self._live_texts + [ax.title, self._live_values]
+            for artist in self._live_artists:
+                artist.set_animated(True)
+        elif self._live_draw_cid is not None:
+            # The previous run's canvas went away with its frame
+            self._live_fig.canvas.mpl_disconnect(self._live_draw_cid)
+        
+        # One Tk canvas per run frame; the figure and artists are reused
+        self._live_canvas = FigureCanvasTkAgg(self._live_fig, master)
+        self._live_bg = None
+        self._live_draw_cid = self._live_canvas.mpl_connect('draw_event', self._on_live_graph_draw)
+        return self._live_canvas.get_tk_widget()
+
+    def _on_live_graph_draw(self, event):
+        """Recapture the static background after every full draw (first paint, resize, rescale)"""
+        canvas = self._live_canvas
+        self._live_bg = canvas.copy_from_bbox(self._live_fig.bbox)
+        self._blit_live_artists()
+
+    def _blit_live_artists(self):
+        for artist in self._live_artists:
+            self._live_fig.draw_artist(artist)
+        self._live_canvas.blit(self._live_fig.bbox)
 
     def _show_live_graph_for_test(self, hole_label, sample_num, result):
         """Show a live graph for a completed torque test"""
+        # Only every Nth result is graphed so batch runs don't pay for a draw per hole
+        self._live_sample_counter += 1
+        if self._live_sample_counter % self.cfg['live_graph_interval'] != 0:
+            return
         try:
-            # Create a simple graph showing the test result
-            graph_window = tk.Toplevel(self.root)
-            graph_window.title(f"Torque Test Result - Hole {hole_label} (Sample {sample_num})")
-            graph_window.geometry("600x400")
-            
-            # Create a simple bar chart showing the result
-            fig, ax = plt.subplots(figsize=(8, 5))
-            
-            # Create a simple visualization of the torque measurement
+            ax = self._live_ax
             target_torque = result['target_torque']
             actual_torque = result['actual_torque']
             
-            # Bar chart
-            bars = ax.bar(['Target', 'Actual'], [target_torque, actual_torque], 
-                         color=['lightblue', 'lightgreen'], alpha=0.7)
-            
-            # Add value labels on bars
-            for bar, value in zip(bars, [target_torque, actual_torque]):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                       f'{value:.1f} Ncm', ha='center', va='bottom')
-            
-            ax.set_ylabel('Torque (Ncm)')
-            ax.set_title(f'Hole {hole_label} - Sample {sample_num}\nTarget: {target_torque:.1f} Ncm, Actual: {actual_torque:.1f} Ncm')
-            ax.grid(True, alpha=0.3)
-            
-            # Add canvas to window
-            canvas = FigureCanvasTkAgg(fig, graph_window)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            # Update the persistent bars and value labels in place
+            for bar, text, value in zip(self._live_bars, self._live_texts, [target_torque, actual_torque]):
+                bar.set_height(value)
+                text.set_y(value + 0.1)
+                text.set_text(_NCM_FMT(value))
+            title = _TITLE_FMT(hole_label, sample_num)
+            if title != ax.get_title():
+                ax.set_title(title, pad=20)
+            self._live_values.set_text(_VALUES_FMT(target_torque, actual_torque))
             
-            # Add close button
-            ttk.Button(graph_window, text="Close", 
-                      command=graph_window.destroy).pack(pady=10)
-            
-            # Auto-close after 5 seconds
-            graph_window.after(5000, graph_window.destroy)
+            # A full redraw is only needed when the y-range must change; otherwise
+            # restore the cached background and blit the changed artists
+            top = max(target_torque, actual_torque) * 1.15
+            y_max = ax.get_ylim()[1]
+            rescale = self._live_bg is None or top > y_max or top < y_max * 0.5
+            if rescale:
+                ax.set_ylim(0, top)
+            if rescale or not self._live_canvas.get_tk_widget().winfo_ismapped():
+                # An unmapped canvas gets one coalesced draw once it is shown
+                self._live_canvas.draw_idle()
+            else:
+                self._live_canvas.restore_region(self._live_bg)
+                self._blit_live_artists()
             
         except Exception as e:
             print(f"Error showing live graph: {e}")
 
-    def save_results_csv(self):
+    def _result_paths(self):
+        """Return the (csv, png) output paths for the current run"""
+        # Use IP address or simulation mode identifier, made safe for filenames
+        connection_id = self.state.get('controller_ip') or self.state.get('com_port') or 'SIM'
+        suffix = f"{connection_id.translate(_FILENAME_UNSAFE)}_{self.state['torque']}"
+        return f"results/torque_results_{suffix}.csv", f"results/torque_plot_{suffix}.png"
+
+    def _finalize_results(self, hole_order, filename):
+        """Write the results CSV and build the plot arrays in a single pass over the results
+        
+        Returns (sample array, hole index array, torque array, min torque, max torque).
+        """
+        import numpy as np
         results = self.state['results']
-        os.makedirs('results', exist_ok=True)
-        # Use IP address or simulation mode identifier for filename
-        connection_id = self.state.get('controller_ip', self.state.get('com_port', 'SIM'))
-        filename = f"results/torque_results_{connection_id}_{self.state['torque']}.csv"
-        with open(filename, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['sample', 'hole_label', 'target_torque', 'actual_torque', 'timestamp'])
-            writer.writeheader()
-            for row in results:
-                writer.writerow(row)
+        n = len(results)
+        samples_arr = np.empty(n, dtype=np.int32)
+        hole_idx_arr = np.empty(n, dtype=np.int32)
+        torques_arr = np.empty(n, dtype=np.float32)
+        y_min = float('inf')
+        y_max = float('-inf')
+        # Fixed schema with no fields that need quoting, so rows are preformatted,
+        # encoded in bounded batches and written straight to the file descriptor
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            _write_all(fd, b'sample,hole_label,target_torque,actual_torque,timestamp\n')
+            lines = []
+            # Results carry epoch floats; local time is formatted here, once per distinct second
+            last_sec = None
+            stamp = ''
+            for i, r in enumerate(results):
+                torque = r['actual_torque']
+                sec = int(r['timestamp'])
+                if sec != last_sec:
+                    stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))
+                    last_sec = sec
+                lines.append(f"{r['sample']},{r['hole_label']},{r['target_torque']:.3f},"
+                             f"{torque:.3f},{stamp}\n")
+                samples_arr[i] = r['sample']
+                hole_idx_arr[i] = hole_order[r['hole_label']]
+                torques_arr[i] = torque
+                if torque < y_min:
+                    y_min = torque
+                if torque > y_max:
+                    y_max = torque
+                if len(lines) == CSV_BATCH_ROWS:
+                    _write_all(fd, ''.join(lines).encode('utf-8'))
+                    lines.clear()
+            if lines:
+                _write_all(fd, ''.join(lines).encode('utf-8'))
+        finally:
+            os.close(fd)
         self.state['csv_file'] = filename
+        return samples_arr, hole_idx_arr, torques_arr, y_min, y_max
+
+    def _get_plot_figure(self):
+        """Return the summary figure and axes, cleared for reuse across runs"""
+        if self._plot_fig is None:
+            # A bare Agg figure: no pyplot manager or Tk window is created for it
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            # Sized to render at exactly the 500x400 preview, so no resample is needed
+            self._plot_fig = Figure(figsize=(5, 4), dpi=100)
+            FigureCanvasAgg(self._plot_fig)
+            self._plot_ax = self._plot_fig.add_subplot()
+        else:
+            # The previous run's PNG may still be encoding from this figure
+            self._join_pending_saves()
+            self._plot_ax.clear()
+        return self._plot_fig, self._plot_ax
+
+    def _save_plot_png(self, fig, plot_path):
+        """Encode the plot PNG and fsync it; runs in a worker thread"""
+        try:
+            with open(plot_path, 'wb') as f:
+                # print_png on the Agg canvas skips savefig's format/rc/bbox machinery
+                fig.canvas.print_png(f, pil_kwargs={"compress_level": 1})
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            print(f"Error saving plot: {e}")
+
+    def _join_pending_saves(self):
+        for thread in self._pending_saves:
+            thread.join()
+        self._pending_saves.clear()
+
+    def _join_label_saves(self):
+        wait(self._pending_label_saves)
+        self._pending_label_saves.clear()
 
     def show_plot(self):
+        import numpy as np
         frame = ttk.Frame(self.root, padding=20)
         frame.pack(fill=tk.BOTH, expand=True)
         ttk.Label(frame, text="Test Results Plot", font=("Arial", 16)).pack(pady=10)
-        results = self.state['results']
-        samples = sorted(set(r['sample'] for r in results))
-        holes = sorted(set(r['hole_label'] for r in results))
-        fig, ax = plt.subplots()
-        for sample in samples:
-            vals = [r['actual_torque'] for r in results if r['sample']==sample]
-            ax.plot(holes, vals, marker='o', label=f'Sample {sample}')
+        # Holes are stored in letter order (ALPHABET slice or preset list) already
+        holes = self.state['holes']
+        hole_order = {h: i for i, h in enumerate(holes)}
+        # Both output names share one suffix, so build them together once
+        csv_path, plot_path = self._result_paths()
+        # One pass writes the CSV and yields everything the plot needs
+        samples_arr, hole_idx_arr, torques_arr, y_min, y_max = self._finalize_results(hole_order, csv_path)
+        fig, ax = self._get_plot_figure()
+        # Slice contiguous per-sample arrays with masks, ordered by hole position
+        holes_arr = np.array(holes)
+        # Every sample 1..N was run, so there is no need to np.unique the results
+        for sample in range(1, self.state['samples'] + 1):
+            mask = samples_arr == sample
+            idx = hole_idx_arr[mask]
+            order = np.argsort(idx, kind='stable')
+            ax.plot(holes_arr[idx[order]], torques_arr[mask][order], marker='o', label=f'Sample {sample}')
+        pad = max((y_max - y_min) * 0.1, 0.5)
+        ax.set_ylim(y_min - pad, y_max + pad)
         ax.set_xlabel('Hole')
         ax.set_ylabel('Torque (Ncm-1)')
         ax.set_title('Torque Test Results')
         ax.legend()
-        # Use IP address or simulation mode identifier for plot filename
-        connection_id = self.state.get('controller_ip', self.state.get('com_port', 'SIM'))
-        plot_path = f"results/torque_plot_{connection_id}_{self.state['torque']}.png"
-        fig.savefig(plot_path)
-        plt.close(fig)
-        img = Image.open(plot_path)
-        img = img.resize((500, 400), Image.LANCZOS)
-        tk_img = ImageTk.PhotoImage(img)
-        canvas = Canvas(frame, width=500, height=400)
+        # Show the rendered Agg buffer directly instead of reading the PNG back
+        fig.canvas.draw()
+        img = Image.fromarray(np.asarray(fig.canvas.buffer_rgba()))
+        # Release the previous run's Tk image before creating the new one
+        self._plot_tk_img = None
+        self._plot_tk_img = ImageTk.PhotoImage(img)
+        # PNG encoding only serves the results folder, so it runs off the Tk thread
+        save_thread = threading.Thread(target=self._save_plot_png, args=(fig, plot_path))
+        save_thread.start()
+        self._pending_saves.append(save_thread)
+        canvas = tk.Canvas(frame, width=500, height=400)
         canvas.pack()
-        canvas.create_image(0, 0, anchor=tk.NW, image=tk_img)
-        frame.tk_img = tk_img
+        canvas.create_image(0, 0, anchor=tk.NW, image=self._plot_tk_img)
         ttk.Label(frame, text=f"Plot and CSV saved to results/ folder.").pack(pady=10)
-        ttk.Button(frame, text="Restart", command=lambda: self.show_step("connect")).pack(pady=10)
+        def restart():
+            self._join_pending_saves()
+            self._join_label_saves()
+            # A new run starts from the connect step with none of this run's answers
+            self.state.clear()
+            self.show_step("connect")
+        ttk.Button(frame, text="Restart", command=restart).pack(pady=10)
         self.current_frame = frame
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = TorqueTestWizard(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    # Also covers exits that skip on_close; a second shutdown is a no-op
+    app._io_pool.shutdown(wait=True)
@@ -2,12 +2,30 @@
 # Abstracts the Tooltalk controller interface for MT6000
 
 import socket
-import subprocess
-import platform
+import sys
 import random
-import datetime
 import time
 import re
+import logging
+
+# Routine traffic is logged at DEBUG so its messages are only formatted when enabled
+log = logging.getLogger(__name__)
+
+# Fixed MT6000 command frames, built once instead of per call
+_CMD_IDENTIFY = b'0001 0001 0040 0001\r\n'
+_CMD_REMOTE_ON = b'0001 0002 0042 0001\r\n'
+_CMD_REMOTE_OFF = b'0001 0002 0042 0000\r\n'
+_CMD_START = b'0001 0018 0041 0001\r\n'
+_CMD_REQ_RESULT = b'0001 0033 0200\r\n'
+# Set-torque frame; the field is the target in cNm, zero-padded to 4 digits
+_CMD_SET_TORQUE = b'0001 0014 0043 %04d\r\n'
+# MID that marks a tightening result reply
+_RESULT_MID = b'0200'
+# Linux busy-poll budget (microseconds) for the control socket; None elsewhere
+_SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46) if sys.platform.startswith('linux') else None
+_BUSY_POLL_US = 50
+# Torque value in cNm within a tightening result
+_TORQUE_RE = re.compile(rb'(\d{4,6})')
 
 class TooltalkAPI:
     def __init__(self):
@@ -15,86 +33,111 @@ class TooltalkAPI:
         self.socket_connection = None
         # Atlas Copco MT6000 specific settings
         self.timeout = 3
-        self.command_delay = 0.1
         self.controller_ip = None
         self.controller_port = 4545  # Default ToolTalk port
-    
-    def _ping_host(self, ip_address):
-        """Check if the controller IP is reachable using ping"""
-        try:
-            # Determine ping command based on OS
-            if platform.system().lower() == "windows":
-                cmd = ["ping", "-n", "1", "-w", "3000", ip_address]
-            else:
-                cmd = ["ping", "-c", "1", "-W", "3", ip_address]
-            
-            # Execute ping command
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            
-            # Check if ping was successful
-            if result.returncode == 0:
-                print(f"Ping successful to {ip_address}")
-                return True
-            else:
-                print(f"Ping failed to {ip_address}: {result.stderr}")
-                return False
-                
-        except subprocess.TimeoutExpired:
-            print(f"Ping timeout to {ip_address}")
-            return False
-        except Exception as e:
-            print(f"Ping error to {ip_address}: {e}")
-            return False
+        # Seconds a socket kept by test_connection may sit idle before it is closed,
+        # so a Test without a Connect does not hold the controller's session
+        self.probe_reuse_ttl = 10
+        # Bytes received past the end of the last reply frame
+        self._rx_buf = bytearray()
+        # Set once the controller closes its end, so reads stop waiting on a dead socket
+        self._rx_closed = False
+        # (ip, socket, monotonic time) left open by a successful test_connection for connect to reuse
+        self._probe_socket = None
+        # Own generator for simulated/fallback values instead of the shared global one
+        self._rng = random.Random()
     
     def test_connection(self, ip_address):
         """Test if the Atlas Copco MT6000 controller is responding on the specified IP"""
         try:
-            # First check network reachability
-            if not self._ping_host(ip_address):
-                print(f"Controller at {ip_address} is not reachable")
-                return False
-            
-            # Try to establish TCP connection
+            # A new test replaces any probe socket kept from an earlier one
+            self._drop_probe_socket()
+            # The TCP connect to the ToolTalk port doubles as the reachability check;
+            # an ICMP ping would cost a process spawn and not prove the service is up
             test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             test_socket.settimeout(self.timeout)
             
             try:
                 # Attempt to connect
                 test_socket.connect((ip_address, self.controller_port))
-                print(f"TCP connection established to {ip_address}:{self.controller_port}")
+                test_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                log.debug("TCP connection established to %s:%s", ip_address, self.controller_port)
                 
                 # Send MT6000 identification command
-                test_socket.send(b'0001 0001 0040 0001\r\n')
-                time.sleep(0.5)
+                test_socket.sendall(_CMD_IDENTIFY)
                 
-                # Try to receive response
+                # Try to receive response; recv blocks until it arrives
                 test_socket.settimeout(2.0)
                 response = test_socket.recv(1024)
                 
                 if response:
-                    response_str = response.decode('utf-8', errors='ignore')
-                    print(f"Response received: {response_str}")
-                    # Look for MT6000 response patterns
-                    if any(pattern in response_str.upper() for pattern in ['MT6000', 'ATLAS', '0040', 'OK']):
-                        test_socket.close()
+                    log.debug("Response received: %r", response)
+                    # Look for MT6000 response patterns (ASCII tokens, so no decode is needed)
+                    upper = response.upper()
+                    if any(pattern in upper for pattern in (b'MT6000', b'ATLAS', b'0040', b'OK')):
+                        # Keep the proven socket open so connect() can skip a second handshake
+                        self._probe_socket = (ip_address, test_socket, time.monotonic())
                         return True
                 
                 test_socket.close()
                 return False
                 
             except socket.timeout:
-                print(f"Connection timeout to {ip_address}:{self.controller_port}")
+                log.warning("Connection timeout to %s:%s", ip_address, self.controller_port)
                 test_socket.close()
                 return False
             except ConnectionRefusedError:
-                print(f"Connection refused by {ip_address}:{self.controller_port}")
+                log.warning("Connection refused by %s:%s", ip_address, self.controller_port)
+                test_socket.close()
+                return False
+            except OSError as e:
+                # No route / host down: what the ping used to report
+                log.warning("Controller at %s is not reachable: %s", ip_address, e)
                 test_socket.close()
                 return False
                 
         except Exception as e:
-            print(f"Connection test error: {e}")
+            log.warning("Connection test error: %s", e)
             return False
     
+    def _take_probe_socket(self, ip_address):
+        """Return the socket kept by test_connection for ip_address if it is still open, else None"""
+        probe = self._probe_socket
+        self._probe_socket = None
+        if probe is None:
+            return None
+        probe_ip, sock, probed_at = probe
+        if probe_ip != ip_address or time.monotonic() - probed_at >= self.probe_reuse_ttl:
+            sock.close()
+            return None
+        # Drain anything left over from the identify exchange; EOF means the
+        # controller has dropped the idle socket since the test
+        sock.setblocking(False)
+        try:
+            while True:
+                if not sock.recv(1024):
+                    sock.close()
+                    return None
+        except BlockingIOError:
+            pass
+        except OSError:
+            sock.close()
+            return None
+        sock.settimeout(self.timeout)
+        return sock
+    
+    def _drop_probe_socket(self):
+        """Close the socket kept by test_connection, if any"""
+        if self._probe_socket is not None:
+            self._probe_socket[1].close()
+            self._probe_socket = None
+    
+    def close_stale_probe(self):
+        """Close the socket kept by test_connection once it has been idle for probe_reuse_ttl"""
+        if (self._probe_socket is not None
+                and time.monotonic() - self._probe_socket[2] >= self.probe_reuse_ttl):
+            self._drop_probe_socket()
+    
     def connect(self, ip_address):
         """Establish connection to the Atlas Copco MT6000 controller via TCP/IP"""
         try:
@@ -105,117 +148,182 @@ class TooltalkAPI:
             if self.socket_connection:
                 self.socket_connection.close()
             
-            # First check network reachability
-            if not self._ping_host(ip_address):
-                print(f"Cannot connect: Controller at {ip_address} is not reachable")
-                return False
-            
-            # Create TCP socket connection
-            self.socket_connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket_connection.settimeout(self.timeout)
-            
-            # Connect to the controller
-            self.socket_connection.connect((ip_address, self.controller_port))
-            print(f"Connected to controller at {ip_address}:{self.controller_port}")
+            # Create TCP socket connection, reusing the socket test_connection just proved
+            self._rx_buf.clear()
+            self._rx_closed = False
+            self.socket_connection = self._take_probe_socket(ip_address)
+            if self.socket_connection is None:
+                self.socket_connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.socket_connection.settimeout(self.timeout)
+                
+                # Connect to the controller
+                self.socket_connection.connect((ip_address, self.controller_port))
+            # Small request/response frames: send each immediately rather than letting
+            # Nagle hold it back, which is what the fixed post-send sleeps papered over
+            self.socket_connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.socket_connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if _SO_BUSY_POLL is not None:
+                # Best effort: shaves the wakeup latency on the controller's short replies
+                try:
+                    self.socket_connection.setsockopt(socket.SOL_SOCKET, _SO_BUSY_POLL, _BUSY_POLL_US)
+                except OSError:
+                    pass
+            log.debug("Connected to controller at %s:%s", ip_address, self.controller_port)
             
             # Initialize MT6000 controller
             # Set controller to remote mode
-            self.socket_connection.send(b'0001 0002 0042 0001\r\n')  # Enable remote control
-            time.sleep(self.command_delay)
+            self._send(_CMD_REMOTE_ON)  # Enable remote control
             
             # Read response
             response = self._read_response()
-            if response and 'OK' in response:
+            if response and b'OK' in response:
                 self.connected = True
-                print(f"Controller initialized successfully at {ip_address}")
+                log.debug("Controller initialized successfully at %s", ip_address)
                 return True
             else:
-                print(f"Initialization failed. Response: {response}")
+                log.warning("Initialization failed. Response: %s", response.decode('utf-8', errors='ignore'))
                 self.socket_connection.close()
                 self.socket_connection = None
                 return False
             
         except socket.timeout:
-            print(f"Connection timeout to {ip_address}:{self.controller_port}")
+            log.warning("Connection timeout to %s:%s", ip_address, self.controller_port)
             self.connected = False
             if self.socket_connection:
                 self.socket_connection.close()
                 self.socket_connection = None
             return False
         except ConnectionRefusedError:
-            print(f"Connection refused by {ip_address}:{self.controller_port}")
+            log.warning("Connection refused by %s:%s", ip_address, self.controller_port)
             self.connected = False
             if self.socket_connection:
                 self.socket_connection.close()
                 self.socket_connection = None
             return False
         except Exception as e:
-            print(f"Connection error: {e}")
+            log.warning("Connection error: %s", e)
             self.connected = False
             if self.socket_connection:
                 self.socket_connection.close()
                 self.socket_connection = None
             return False
     
+    def _send(self, *frames):
+        """Send one or more command frames to the controller in a single write"""
+        # sendall retries short writes, which a bare send() would silently drop
+        self.socket_connection.sendall(frames[0] if len(frames) == 1 else b''.join(frames))
+    
     def _read_response(self):
-        """Read response from MT6000 controller via TCP socket"""
+        """Read one reply frame from the MT6000 controller as stripped bytes
+        
+        Replies are checked for ASCII tokens only, so they are not decoded here.
+        """
         try:
             if not self.socket_connection:
-                return ""
-            
-            # Set socket timeout for reading
-            self.socket_connection.settimeout(self.timeout)
+                return b""
             
-            response = b''
-            start_time = time.time()
+            sock = self.socket_connection
+            buf = self._rx_buf
+            # A reply may already be buffered from the previous read
+            idx = buf.find(b'\r\n')
+            if idx == -1 and self._rx_closed:
+                # Nothing buffered and the controller has hung up: no point waiting
+                buf.clear()
+                return b""
+            # recv blocks until data arrives, so the only limit is the overall deadline;
+            # each recv waits just for the time left rather than a fresh full timeout
+            deadline = time.monotonic() + self.timeout
             
-            while time.time() - start_time < self.timeout:
+            while idx == -1:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                sock.settimeout(remaining)
                 try:
-                    # Try to receive data
-                    chunk = self.socket_connection.recv(1024)
-                    if chunk:
-                        response += chunk
-                        
-                        # Check if we have a complete response (ends with \r\n)
-                        if b'\r\n' in response:
-                            break
-                    else:
-                        # No more data available
-                        break
-                        
+                    chunk = sock.recv(1024)
                 except socket.timeout:
                     # Timeout waiting for data
                     break
                 except Exception as e:
-                    print(f"Error receiving data: {e}")
+                    log.warning("Error receiving data: %s", e)
+                    break
+                if not chunk:
+                    # Connection closed by the controller; later reads return at once
+                    self._rx_closed = True
+                    self.connected = False
                     break
+                # Only the new bytes (plus one for a split \r\n) can complete the response
+                search_from = max(len(buf) - 1, 0)
+                buf += chunk
+                idx = buf.find(b'\r\n', search_from)
             
-            return response.decode('utf-8', errors='ignore').strip()
+            sock.settimeout(self.timeout)
+            if idx == -1:
+                # Incomplete reply: hand back whatever arrived, as before
+                frame = bytes(buf)
+                buf.clear()
+            else:
+                # One frame per call; bytes after \r\n are kept for the next read
+                frame = bytes(buf[:idx])
+                del buf[:idx + 2]
+            return frame.strip()
         
         except Exception as e:
-            print(f"Error reading response: {e}")
-            return ""
+            log.warning("Error reading response: %s", e)
+            return b""
+    
+    def _drain_rx(self):
+        """Take whatever the controller has already sent, without waiting, and return its frames
+        
+        Called before a request so a late reply to an earlier one, whether buffered
+        here or still in the kernel, cannot be read as the answer to the new request.
+        """
+        sock = self.socket_connection
+        buf = self._rx_buf
+        if sock is not None and not self._rx_closed:
+            sock.setblocking(False)
+            try:
+                while True:
+                    chunk = sock.recv(1024)
+                    if not chunk:
+                        self._rx_closed = True
+                        self.connected = False
+                        break
+                    buf += chunk
+            except BlockingIOError:
+                pass
+            except OSError as e:
+                log.warning("Error draining receive buffer: %s", e)
+            finally:
+                sock.settimeout(self.timeout)
+        # Complete frames only; a trailing partial frame is dropped with the rest
+        frames = [frame.strip() for frame in bytes(buf).split(b'\r\n')[:-1]]
+        buf.clear()
+        return frames
     
     def set_torque_target(self, target_torque):
         """Set target torque on MT6000 controller"""
         try:
             if not self.socket_connection or not self.connected:
-                print("Not connected to controller")
+                log.warning("Not connected to controller")
                 return False
                 
             # Convert torque to MT6000 format (usually in cNm - centinewton meters)
             torque_cnm = int(target_torque * 100)  # Convert Nm to cNm
             
-            # Format torque command for MT6000
-            command = f'0001 0014 0043 {torque_cnm:04d}\r\n'
-            self.socket_connection.send(command.encode())
-            time.sleep(self.command_delay)
+            # Format torque command for MT6000 straight into bytes; drop any stale
+            # frames first so the reply read below is the one to this command
+            self._drain_rx()
+            self._send(_CMD_SET_TORQUE % torque_cnm)
             
             response = self._read_response()
-            return 'OK' in response
+            # A result that arrived after the drain answers an old poll, not this command
+            while response and _RESULT_MID in response:
+                response = self._read_response()
+            return b'OK' in response
             
         except Exception as e:
-            print(f"Error setting torque: {e}")
+            log.warning("Error setting torque: %s", e)
             return False
     
     def run_torque_test(self, hole_label, target_torque):
@@ -229,21 +337,35 @@ class TooltalkAPI:
                 raise Exception("Failed to set target torque")
             
             # Start tightening cycle
-            self.socket_connection.send(b'0001 0018 0041 0001\r\n')  # Start cycle
-            time.sleep(self.command_delay)
+            # Any acknowledgement is skipped by the result polls below rather than
+            # waited for here, since the controller may not send one
+            self._send(_CMD_START)  # Start cycle
             
             # Wait for cycle completion and read result
             max_wait_time = 30  # Maximum wait time in seconds
             start_time = time.time()
             
+            # _read_response blocks until the controller answers, so there is no fixed
+            # wait per request; only back off (10 ms growing to 100 ms) between retries
+            backoff = 0.01
+            
             while time.time() - start_time < max_wait_time:
-                # Request last result
-                self.socket_connection.send(b'0001 0033 0200\r\n')  # Request last tightening result
-                time.sleep(0.5)
+                # Request last result; late replies to earlier requests are discarded
+                # first so they cannot be taken for this poll's answer
+                self._drain_rx()
+                self._send(_CMD_REQ_RESULT)  # Request last tightening result
                 
                 response = self._read_response()
+                if self._rx_closed and not response:
+                    raise Exception("Controller closed the connection")
+                if response and _RESULT_MID not in response:
+                    # Skip e.g. a start acknowledgement; the result may already be behind it
+                    for frame in self._drain_rx():
+                        if _RESULT_MID in frame:
+                            response = frame
+                            break
                 
-                if response and '0200' in response:
+                if response and _RESULT_MID in response:
                     # Parse the tightening result
                     actual_torque = self._parse_torque_result(response, target_torque)
                     
@@ -251,10 +373,11 @@ class TooltalkAPI:
                         'hole_label': hole_label,
                         'target_torque': target_torque,
                         'actual_torque': actual_torque,
-                        'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        'timestamp': time.time()  # Epoch seconds; formatted when written out
                     }
                 
-                time.sleep(0.5)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 0.1)
             
             raise Exception("Timeout waiting for tightening result")
             
@@ -266,7 +389,7 @@ class TooltalkAPI:
         try:
             # MT6000 response format varies, this is a common pattern
             # Look for torque value in the response
-            torque_match = re.search(r'(\d{4,6})', response)
+            torque_match = _TORQUE_RE.search(response)
             
             if torque_match:
                 # Convert from cNm to Nm
@@ -274,17 +397,18 @@ class TooltalkAPI:
                 return actual_torque
             else:
                 # If parsing fails, use target torque with small variation for testing
-                print(f"Could not parse torque from response: {response}")
-                return target_torque + random.uniform(-0.5, 0.5)
+                log.warning("Could not parse torque from response: %s",
+                            response.decode('utf-8', errors='ignore'))
+                return target_torque + self._rng.uniform(-0.5, 0.5)
                 
         except Exception as e:
-            print(f"Error parsing torque result: {e}")
-            return target_torque + random.uniform(-0.5, 0.5)
+            log.warning("Error parsing torque result: %s", e)
+            return target_torque + self._rng.uniform(-0.5, 0.5)
     
     def simulate_torque_test(self, hole_label, target_torque):
         """Simulation mode - generate realistic fake data"""
         # Add some random variation to simulate real measurements
-        variation = random.uniform(-1.5, 1.5)
+        variation = self._rng.uniform(-1.5, 1.5)
         actual_torque = target_torque + variation
         
         # Simulate measurement time
@@ -294,22 +418,22 @@ class TooltalkAPI:
             'hole_label': hole_label,
             'target_torque': target_torque,
             'actual_torque': actual_torque,
-            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': time.time()  # Epoch seconds; formatted when written out
         }
     
     def disconnect(self):
         """Clean disconnect from controller"""
         try:
+            self._drop_probe_socket()
             if self.socket_connection and self.connected:
                 # Disable remote control
-                self.socket_connection.send(b'0001 0002 0042 0000\r\n')
-                time.sleep(self.command_delay)
+                self._send(_CMD_REMOTE_OFF)
                 
             if self.socket_connection:
                 self.socket_connection.close()
                 self.socket_connection = None
-                print(f"Disconnected from controller at {self.controller_ip}")
+                log.debug("Disconnected from controller at %s", self.controller_ip)
         except Exception as e:
-            print(f"Error during disconnect: {e}")
+            log.warning("Error during disconnect: %s", e)
         finally:
             self.connected = False
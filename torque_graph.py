@@ -3,7 +3,10 @@
 
 import threading
 import time
-import queue
+import matplotlib
+# Figures are embedded explicitly with FigureCanvasTkAgg, so pyplot only needs
+# the Agg backend and never builds its own Tk figure manager/window
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -11,9 +14,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
 import os
-import csv
 from datetime import datetime
-import random
+
+_CSV_HEADER = b'Time (s),Torque (Ncm),Angle (deg)\n'
+
+def _format_rows(rows):
+    """Preformat (time, torque, angle) rows as CSV bytes, with no csv.writer quoting pass"""
+    return ''.join([f"{t:.4f},{q:.3f},{a:.2f}\n" for t, q, a in rows]).encode('ascii')
 
 class TorqueGraph:
     def __init__(self, parent_window=None, enable_gui=True):
@@ -28,10 +35,8 @@ class TorqueGraph:
         self.enable_gui = enable_gui
         self.is_capturing = False
         self.capture_thread = None
-        self.data_queue = queue.Queue()
-        self.torque_data = []
-        self.angle_data = []
-        self.time_data = []
+        # Guards the back buffer, which the capture thread writes and readers copy out
+        self._lock = threading.Lock()
         self.start_time = None
         
         # GUI components
@@ -40,12 +45,80 @@ class TorqueGraph:
         self.ax = None
         self.canvas = None
         self.ani = None
+        self._csv_path = None
+        self._csv_rows = 0
         
         # Configuration
         self.sample_rate = 10  # Hz
+        # Samples generated per capture iteration (half a second at 10 Hz), so the
+        # live graph still moves smoothly while NumPy does the per-sample math
+        self.batch_size = 5
+        self._rng = np.random.default_rng()
         self.max_samples = 1000
         self.timeout_seconds = 30
         
+        # Bounded sample history; the oldest samples are overwritten past max_samples
+        self._reset_data()
+        
+    def _reset_data(self):
+        """Start empty time/torque/angle ring buffers of max_samples float32 columns
+        
+        The capture thread writes into the back buffer; readers copy it, in time
+        order, into the front buffer under the lock and only ever read that copy.
+        """
+        self._back = np.zeros((3, self.max_samples), dtype=np.float32)
+        self._front = np.zeros_like(self._back)
+        self._write_idx = 0  # Next ring slot in the back buffer
+        self._count = 0  # Valid samples in the back buffer
+        self._total = 0  # Samples written since the capture started
+        self._shown = 0  # Valid samples in the front buffer
+        self._shown_total = 0  # _total as of the last front-buffer copy
+    
+    def _snapshot(self):
+        """Copy the back buffer into the front buffer in time order; True if it had new samples"""
+        with self._lock:
+            if self._total == self._shown_total:
+                return False
+            n, idx = self._count, self._write_idx
+            if n < self.max_samples:
+                np.copyto(self._front[:, :n], self._back[:, :n])
+            else:
+                # Full ring: the oldest sample sits at the write index
+                tail = self.max_samples - idx
+                np.copyto(self._front[:, :tail], self._back[:, idx:])
+                np.copyto(self._front[:, tail:], self._back[:, :idx])
+            self._shown = n
+            self._shown_total = self._total
+        return True
+    
+    def _store_batch(self, batch):
+        """Write a (3, k) batch of time/torque/angle samples into the back ring buffer"""
+        k = batch.shape[1]
+        m = self.max_samples
+        if k > m:
+            batch = batch[:, -m:]
+            k = m
+        with self._lock:
+            idx = self._write_idx
+            first = min(k, m - idx)
+            self._back[:, idx:idx + first] = batch[:, :first]
+            self._back[:, :k - first] = batch[:, first:]
+            self._write_idx = (idx + k) % m
+            self._count = min(self._count + k, m)
+            self._total += k
+    
+    @property
+    def time_data(self):
+        return self._front[0, :self._shown]
+    
+    @property
+    def torque_data(self):
+        return self._front[1, :self._shown]
+    
+    @property
+    def angle_data(self):
+        return self._front[2, :self._shown]
+    
     def start_capture(self, title="Live Torque Graph", save_to_file=True):
         """
         Start live torque capture and display
@@ -58,15 +131,25 @@ class TorqueGraph:
             return False
             
         # Reset data
-        self.torque_data = []
-        self.angle_data = []
-        self.time_data = []
-        self.start_time = time.time()
+        self._reset_data()
+        # Stream samples to the CSV as they are captured, so the file keeps the whole
+        # run while the in-memory ring only holds the max_samples display window
+        self._csv_path = None
+        csv_file = None
+        if save_to_file:
+            self._csv_path = self._new_csv_path()
+            csv_file = open(self._csv_path, 'wb', buffering=1 << 16)
+            csv_file.write(_CSV_HEADER)
+            self._csv_rows = 0
+        # Monotonic, so capture times are immune to wall-clock adjustments
+        self.start_time = time.monotonic()
         self.is_capturing = True
         
-        # Start capture thread
+        # Start capture thread; it gets its own CSV handle so a previous capture's
+        # thread that outlived stop_capture's join cannot write to or close this one
         self.capture_thread = threading.Thread(
             target=self._capture_loop,
+            args=(csv_file,),
             daemon=True
         )
         self.capture_thread.start()
@@ -97,43 +180,63 @@ class TorqueGraph:
         if self.ani:
             self.ani.event_source.stop()
         
-        # Save data if requested
-        if save_to_file and self.torque_data:
+        # Data was streamed to file during capture; otherwise save the window if requested
+        if self._csv_path:
+            if self._csv_rows:
+                return self._csv_path
+            # Nothing was captured: drop the header-only file, as no file was written before
+            if not self.capture_thread.is_alive():
+                os.remove(self._csv_path)
+            return None
+        self._snapshot()
+        if save_to_file and self._shown:
             filename = self._save_data_to_csv()
             return filename
         
         return None
     
-    def _capture_loop(self):
+    def _capture_loop(self, csv_file):
         """Main capture loop running in separate thread"""
-        while self.is_capturing:
-            try:
+        # Paced against fixed deadlines so loop body time does not add up as drift
+        period = self.batch_size / self.sample_rate
+        next_t = time.monotonic()
+        me = threading.current_thread()
+        try:
+            # A newer start_capture replaces capture_thread; this thread then stops
+            # rather than feeding samples into the new capture
+            while self.is_capturing and self.capture_thread is me:
                 # Simulate torque and angle data
                 # In real implementation, this would read from the screwdriver
-                current_time = time.time() - self.start_time
-                
-                # Generate realistic torque data with some variation
-                base_torque = 20.0 + 5.0 * np.sin(current_time * 2) + random.uniform(-1, 1)
-                angle = current_time * 30  # Simulate angle progression
+                current_time = time.monotonic() - self.start_time
                 
-                # Add data to queue for thread-safe access
-                self.data_queue.put({
-                    'time': current_time,
-                    'torque': base_torque,
-                    'angle': angle
-                })
+                # Generate the next batch of samples in one vectorized step
+                t_vec = current_time + np.arange(self.batch_size) / self.sample_rate
+                torques = 20.0 + 5.0 * np.sin(t_vec * 2) + self._rng.uniform(-1, 1, self.batch_size)
+                angles = t_vec * 30  # Simulate angle progression
                 
-                # Limit data size
-                if len(self.torque_data) > self.max_samples:
-                    self.torque_data.pop(0)
-                    self.angle_data.pop(0)
-                    self.time_data.pop(0)
+                if self.capture_thread is not me:
+                    break
+                # Hand the batch to the GUI through the ring buffer
+                self._store_batch(np.vstack((t_vec, torques, angles)))
+                if csv_file:
+                    csv_file.write(_format_rows(zip(t_vec.tolist(), torques.tolist(),
+                                                          angles.tolist())))
+                    self._csv_rows += len(t_vec)
                 
-                time.sleep(1.0 / self.sample_rate)
+                next_t += period
+                slack = next_t - time.monotonic()
+                if slack > 0:
+                    time.sleep(slack)
+                else:
+                    # Fell behind (e.g. a stall); resync instead of bursting to catch up
+                    next_t = time.monotonic()
                 
-            except Exception as e:
-                print(f"Error in capture loop: {e}")
-                break
+        except Exception as e:
+            print(f"Error in capture loop: {e}")
+        finally:
+            # The capture thread owns its streamed CSV, so it closes it on exit
+            if csv_file:
+                csv_file.close()
     
     def _create_graph_window(self, title):
         """Create the graph window"""
@@ -150,6 +253,14 @@ class TorqueGraph:
         self.ax.set_ylabel('Torque (Ncm)')
         self.ax.set_title('Live Torque Measurement')
         self.ax.grid(True, alpha=0.3)
+        # Lines and the angle axis are built once and only get new data per frame;
+        # animated lines are left out of full draws and blitted over the background
+        self.line_torque, = self.ax.plot([], [], 'b-', linewidth=2, label='Torque', animated=True)
+        self.ax2 = self.ax.twinx()
+        self.line_angle, = self.ax2.plot([], [], 'r--', alpha=0.7, label='Angle', animated=True)
+        self.ax2.set_ylabel('Angle (degrees)', color='r')
+        self.ax2.tick_params(axis='y', labelcolor='r')
+        self.ax.legend(loc='upper left')
         
         # Create canvas
         self.canvas = FigureCanvasTkAgg(self.fig, self.graph_window)
@@ -172,8 +283,11 @@ class TorqueGraph:
         if not self.enable_gui or not self.fig:
             return
             
+        # Redraw once per captured batch: faster frames would find nothing new
+        interval_ms = max(50, int(1000 * self.batch_size / max(1, self.sample_rate)))
         self.ani = animation.FuncAnimation(
-            self.fig, self._update_graph, interval=100, blit=False
+            self.fig, self._update_graph, interval=interval_ms, blit=True,
+            cache_frame_data=False
         )
     
     def _update_graph(self, frame):
@@ -181,42 +295,43 @@ class TorqueGraph:
         if not self.enable_gui or not self.ax:
             return
             
-        # Get new data from queue
-        new_data_count = 0
-        while not self.data_queue.empty():
-            try:
-                data = self.data_queue.get_nowait()
-                self.time_data.append(data['time'])
-                self.torque_data.append(data['torque'])
-                self.angle_data.append(data['angle'])
-                new_data_count += 1
-            except queue.Empty:
-                break
-        
-        if new_data_count > 0:
-            # Clear and redraw
-            self.ax.clear()
-            self.ax.set_xlabel('Time (s)')
-            self.ax.set_ylabel('Torque (Ncm)')
-            self.ax.set_title('Live Torque Measurement')
-            self.ax.grid(True, alpha=0.3)
-            
-            if self.time_data:
-                self.ax.plot(self.time_data, self.torque_data, 'b-', linewidth=2, label='Torque')
-                
-                # Add angle on secondary y-axis if available
-                if self.angle_data:
-                    ax2 = self.ax.twinx()
-                    ax2.plot(self.time_data, self.angle_data, 'r--', alpha=0.7, label='Angle')
-                    ax2.set_ylabel('Angle (degrees)', color='r')
-                    ax2.tick_params(axis='y', labelcolor='r')
-                
-                self.ax.legend(loc='upper left')
-                
-                # Update status
-                if hasattr(self, 'status_label'):
-                    max_torque = max(self.torque_data) if self.torque_data else 0
-                    self.status_label.config(text=f"Capturing... Max: {max_torque:.1f} Ncm")
+        # Copy out whatever the capture thread has written since the last frame
+        if not self._snapshot():
+            return ()
+        
+        self.line_torque.set_data(self.time_data, self.torque_data)
+        self.line_angle.set_data(self.time_data, self.angle_data)
+        # Ticks and labels are part of the blit background, so only a limit
+        # change needs a full draw (which also refreshes that background)
+        if self._rescale_if_needed():
+            self.canvas.draw()
+        
+        # Update status
+        if hasattr(self, 'status_label'):
+            max_torque = self.torque_data.max()
+            self.status_label.config(text=f"Capturing... Max: {max_torque:.1f} Ncm")
+        
+        return self.line_torque, self.line_angle
+    
+    def _rescale_if_needed(self):
+        """Grow the axis limits with headroom when data leaves them; True if they changed"""
+        changed = False
+        t_min, t_max = float(self.time_data[0]), float(self.time_data[-1])
+        x_lo, x_hi = self.ax.get_xlim()
+        if t_max > x_hi or t_min > x_lo + (x_hi - x_lo) / 2:
+            # Room for roughly as much time again before the next rescale
+            self.ax.set_xlim(t_min, t_min + max((t_max - t_min) * 2, 5.0))
+            changed = True
+        # Angle only ever grows, so it gets as much headroom again as its current range
+        for ax, data, headroom in ((self.ax, self.torque_data, 0.25),
+                                   (self.ax2, self.angle_data, 1.0)):
+            d_min, d_max = float(data.min()), float(data.max())
+            y_lo, y_hi = ax.get_ylim()
+            if d_min < y_lo or d_max > y_hi:
+                pad = max((d_max - d_min) * headroom, 1.0)
+                ax.set_ylim(d_min - pad, d_max + pad)
+                changed = True
+        return changed
     
     def _stop_button_clicked(self):
         """Handle stop button click"""
@@ -226,46 +341,46 @@ class TorqueGraph:
     
     def _save_data_to_csv(self):
         """Save captured data to CSV file"""
-        if not self.torque_data:
+        if not self._shown:
             return None
             
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"results/live_torque_{timestamp}.csv"
+        filename = self._new_csv_path()
         
-        os.makedirs('results', exist_ok=True)
-        
-        with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Time (s)', 'Torque (Ncm)', 'Angle (deg)'])
-            
-            for i in range(len(self.time_data)):
-                writer.writerow([
-                    self.time_data[i],
-                    self.torque_data[i],
-                    self.angle_data[i] if i < len(self.angle_data) else 0
-                ])
+        rows = zip(self.time_data.tolist(), self.torque_data.tolist(), self.angle_data.tolist())
+        with open(filename, 'wb') as f:
+            f.write(_CSV_HEADER + _format_rows(rows))
         
         return filename
     
+    def _new_csv_path(self):
+        """Return a timestamped capture CSV path under results/"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs('results', exist_ok=True)
+        return f"results/live_torque_{timestamp}.csv"
+    
     def get_latest_torque(self):
         """Get the most recent torque reading"""
-        return self.torque_data[-1] if self.torque_data else 0.0
+        self._snapshot()
+        return float(self.torque_data[-1]) if self._shown else 0.0
     
     def get_max_torque(self):
         """Get the maximum torque recorded"""
-        return max(self.torque_data) if self.torque_data else 0.0
+        self._snapshot()
+        return float(self.torque_data.max()) if self._shown else 0.0
     
     def get_data_summary(self):
         """Get summary statistics of captured data"""
-        if not self.torque_data:
+        self._snapshot()
+        if not self._shown:
             return None
-            
+        
+        torque = self.torque_data
         return {
-            'samples': len(self.torque_data),
-            'duration': self.time_data[-1] - self.time_data[0] if len(self.time_data) > 1 else 0,
-            'max_torque': max(self.torque_data),
-            'min_torque': min(self.torque_data),
-            'avg_torque': sum(self.torque_data) / len(self.torque_data)
+            'samples': self._shown,
+            'duration': float(self.time_data[-1] - self.time_data[0]) if self._shown > 1 else 0,
+            'max_torque': float(torque.max()),
+            'min_torque': float(torque.min()),
+            'avg_torque': float(torque.mean())
         }
 
 